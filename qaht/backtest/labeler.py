@@ -4,10 +4,11 @@ This tells the model what a multi-bagger looks like
 """
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Optional
 import logging
 
-from ..db import session_scope
+from ..db import session_scope, bulk_upsert
 from ..schemas import PriceOHLC, Labels
 from ..config import get_config
 from sqlalchemy import select
@@ -60,50 +61,50 @@ def label_explosions(symbol: str, horizon: int = 10, threshold: Optional[float]
         # Mark explosions
         df['explosive_10d'] = df['fwd_ret_10d'] >= threshold
 
-        # Calculate lead time (days until explosion)
-        df['lead_time_days'] = None
-
-        for idx in df[df['explosive_10d']].index:
-            # Find when the price actually moved
-            if idx + horizon < len(df):
-                prices_forward = df['close'].iloc[idx:idx+horizon+1].values
-                entry_price = prices_forward[0]
-
-                for day, price in enumerate(prices_forward[1:], 1):
-                    if (price / entry_price - 1) >= threshold:
-                        df.loc[idx, 'lead_time_days'] = day
-                        break
-
-        # Upsert labels
-        inserted = 0
-        updated = 0
-
-        for _, row in df.iterrows():
-            if pd.isna(row['fwd_ret_10d']):
-                continue
-
-            existing = session.get(Labels, (symbol, row['date']))
+        # Calculate lead time (days until explosion): first day in the
+        # forward window whose return from entry crosses the threshold
+        close = df['close'].to_numpy(dtype=np.float64)
+        lead_time = np.full(len(close), np.nan)
+
+        # Most days are not explosive (and the window always crosses on an
+        # explosive day), so only those rows' forward windows are scanned
+        explosive = np.flatnonzero(df['explosive_10d'].to_numpy())
+
+        if explosive.size:
+            windows = sliding_window_view(close, horizon + 1)[explosive]
+            crossed = (windows[:, 1:] / windows[:, :1] - 1) >= threshold
+            lead_time[explosive] = crossed.argmax(axis=1) + 1
+
+        df['lead_time_days'] = lead_time
+
+        # Upsert labels: build all records in one pass over the columns,
+        # then write them with a single set-based upsert
+        labeled = df[df['fwd_ret_10d'].notna()]
+        records = [
+            {
+                'symbol': symbol,
+                'date': date,
+                'fwd_ret_10d': float(ret_10d),
+                'fwd_ret_30d': None if np.isnan(ret_30d) else float(ret_30d),
+                'explosive_10d': bool(is_explosive),
+                'lead_time_days': None if np.isnan(lead) else int(lead)
+            }
+            for date, ret_10d, ret_30d, is_explosive, lead in zip(
+                labeled['date'],
+                labeled['fwd_ret_10d'].to_numpy(dtype=np.float64),
+                labeled['fwd_ret_30d'].to_numpy(dtype=np.float64),
+                labeled['explosive_10d'].to_numpy(),
+                labeled['lead_time_days'].to_numpy(dtype=np.float64)
+            )
+        ]
 
-            if existing:
-                existing.fwd_ret_10d = float(row['fwd_ret_10d'])
-                existing.fwd_ret_30d = float(row['fwd_ret_30d']) if pd.notna(row['fwd_ret_30d']) else None
-                existing.explosive_10d = bool(row['explosive_10d'])
-                existing.lead_time_days = int(row['lead_time_days']) if pd.notna(row['lead_time_days']) else None
-                updated += 1
-            else:
-                label = Labels(
-                    symbol=symbol,
-                    date=row['date'],
-                    fwd_ret_10d=float(row['fwd_ret_10d']),
-                    fwd_ret_30d=float(row['fwd_ret_30d']) if pd.notna(row['fwd_ret_30d']) else None,
-                    explosive_10d=bool(row['explosive_10d']),
-                    lead_time_days=int(row['lead_time_days']) if pd.notna(row['lead_time_days']) else None
-                )
-                session.add(label)
-                inserted += 1
+        written = bulk_upsert(
+            session, Labels, records,
+            update_columns=['fwd_ret_10d', 'fwd_ret_30d', 'explosive_10d', 'lead_time_days']
+        )
 
         explosions = df['explosive_10d'].sum()
-        logger.info(f"Labeled {symbol}: {explosions} explosions found ({inserted} inserted, {updated} updated)")
+        logger.info(f"Labeled {symbol}: {explosions} explosions found ({written} labels written)")
 
 
 def label_triple_barrier(symbol: str, upper_mult: float = 2.0, lower_mult: float = 1.0, time_limit: int = 10):
@@ -144,63 +145,58 @@ def label_triple_barrier(symbol: str, upper_mult: float = 2.0, lower_mult: float
         )
         df['atr'] = df['tr'].rolling(window=14).mean()
 
-        results = []
-
-        for idx in range(len(df) - time_limit):
-            entry_price = df['close'].iloc[idx]
-            atr = df['atr'].iloc[idx]
-
-            if pd.isna(atr) or atr == 0:
-                continue
+        # Forward windows: row i holds days i+1 .. i+time_limit
+        n_events = len(df) - time_limit
+        if n_events <= 0:
+            logger.info(f"Triple-barrier labeled 0 events for {symbol}")
+            return
 
-            upper_barrier = entry_price + (upper_mult * atr)
-            lower_barrier = entry_price - (lower_mult * atr)
+        close = df['close'].to_numpy(dtype=np.float64)[:n_events]
+        atr = df['atr'].to_numpy(dtype=np.float64)[:n_events]
+        future_high = sliding_window_view(df['high'].to_numpy(dtype=np.float64)[1:], time_limit)[:n_events]
+        future_low = sliding_window_view(df['low'].to_numpy(dtype=np.float64)[1:], time_limit)[:n_events]
 
-            # Check forward prices
-            label = 0  # 0 = time stop
-            time_to_hit = time_limit
+        valid = ~np.isnan(atr) & (atr != 0)
+        close, atr = close[valid], atr[valid]
+        future_high, future_low = future_high[valid], future_low[valid]
 
-            for day in range(1, time_limit + 1):
-                if idx + day >= len(df):
-                    break
+        upper_barrier = close + (upper_mult * atr)
+        lower_barrier = close - (lower_mult * atr)
 
-                future_high = df['high'].iloc[idx + day]
-                future_low = df['low'].iloc[idx + day]
+        upper_hit = future_high >= upper_barrier[:, None]
+        lower_hit = future_low <= lower_barrier[:, None]
 
-                if future_high >= upper_barrier:
-                    label = 1  # Upper barrier hit
-                    time_to_hit = day
-                    break
-                elif future_low <= lower_barrier:
-                    label = -1  # Lower barrier hit
-                    time_to_hit = day
-                    break
+        # First day either barrier is touched; the upper barrier wins ties
+        hit = upper_hit | lower_hit
+        touched = hit.any(axis=1)
+        first_day = hit.argmax(axis=1)
 
-            results.append({
-                'date': df['date'].iloc[idx],
-                'tb_label': label,
-                'tb_time': time_to_hit
-            })
+        tb_label = np.where(
+            touched,
+            np.where(upper_hit[np.arange(len(first_day)), first_day], 1, -1),  # 1 = upper, -1 = lower
+            0  # 0 = time stop
+        )
+        tb_time = np.where(touched, first_day + 1, time_limit)
 
         # Update labels table
-        for result in results:
-            existing = session.get(Labels, (symbol, result['date']))
-
-            if existing:
-                existing.tb_label = result['tb_label']
-                existing.tb_time = result['tb_time']
-            else:
-                label = Labels(
-                    symbol=symbol,
-                    date=result['date'],
-                    fwd_ret_10d=None,
-                    explosive_10d=False,
-                    tb_label=result['tb_label'],
-                    tb_time=result['tb_time']
-                )
-                session.add(label)
-
-        logger.info(f"Triple-barrier labeled {len(results)} events for {symbol}")
+        dates = df['date'].to_numpy()[:n_events][valid]
+        records = [
+            {
+                'symbol': symbol,
+                'date': date,
+                'fwd_ret_10d': None,
+                'explosive_10d': False,
+                'tb_label': int(label),
+                'tb_time': int(days)
+            }
+            for date, label, days in zip(dates, tb_label, tb_time)
+        ]
+
+        bulk_upsert(session, Labels, records, update_columns=['tb_label', 'tb_time'])
+
+        up = np.count_nonzero(tb_label == 1)
+        down = np.count_nonzero(tb_label == -1)
+        logger.info(f"Triple-barrier labeled {len(records)} events for {symbol} ({up} up, {down} down)")
 
 
 def get_explosion_stats(symbols: Optional[list] = None):
@@ -4,14 +4,15 @@ Configuration management with type safety and environment variable support
 import os
 import configparser
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Tuple
 from dataclasses import dataclass
+from functools import cached_property
 import logging
 
 logger = logging.getLogger("qaht.config")
 
 
-@dataclass
+@dataclass(slots=True)
 class PipelineConfig:
     """Pipeline execution configuration"""
     lookback_days: int = 400
@@ -19,7 +20,7 @@ class PipelineConfig:
     max_concurrent: int = 5
 
 
-@dataclass
+@dataclass(slots=True)
 class FeatureConfig:
     """Feature computation configuration"""
     bb_window: int = 20
@@ -32,7 +33,7 @@ class FeatureConfig:
             self.ma_windows = [20, 50, 200]
 
 
-@dataclass
+@dataclass(slots=True)
 class BacktestConfig:
     """Backtesting configuration"""
     initial_capital: float = 100000.0
@@ -43,7 +44,7 @@ class BacktestConfig:
     explosion_threshold_crypto: float = 0.30
 
 
-@dataclass
+@dataclass(slots=True)
 class ScoringConfig:
     """Model scoring configuration"""
     min_samples: int = 200
@@ -55,12 +56,16 @@ class ConfigManager:
     """
     Central configuration manager
     Reads from qaht.cfg and .env files
+
+    Section dataclasses are built once per instance; feature code reads
+    them inside per-symbol loops.
     """
 
     def __init__(self, config_path: str = "qaht.cfg", env_path: str = ".env"):
         self.config_path = Path(config_path)
         self.env_path = Path(env_path)
         self._config = configparser.ConfigParser()
+        self._universe_cache: Dict[Tuple[str, int], List[str]] = {}
 
         if self.config_path.exists():
             self._config.read(config_path)
@@ -94,7 +99,7 @@ class ConfigManager:
         """Log file path"""
         return os.getenv("LOG_FILE", "logs/qaht.log")
 
-    @property
+    @cached_property
     def pipeline(self) -> PipelineConfig:
         """Pipeline configuration"""
         if "pipeline" not in self._config:
@@ -107,7 +112,7 @@ class ConfigManager:
             max_concurrent=section.getint("max_concurrent", 5)
         )
 
-    @property
+    @cached_property
     def features(self) -> FeatureConfig:
         """Feature computation configuration"""
         if "features" not in self._config:
@@ -124,7 +129,7 @@ class ConfigManager:
             social_delta_window=section.getint("social_delta_window", 7)
         )
 
-    @property
+    @cached_property
     def backtest(self) -> BacktestConfig:
         """Backtesting configuration"""
         if "backtest" not in self._config:
@@ -140,7 +145,7 @@ class ConfigManager:
             explosion_threshold_crypto=section.getfloat("explosion_threshold_crypto", 0.30)
         )
 
-    @property
+    @cached_property
     def scoring(self) -> ScoringConfig:
         """Model scoring configuration"""
         if "scoring" not in self._config:
@@ -156,7 +161,7 @@ class ConfigManager:
     def get_universe_symbols(self) -> List[str]:
         """
         Load symbols from configured universe file
-        Returns list of uppercase ticker symbols
+        Returns list of uppercase ticker symbols (a fresh copy per call)
         """
         if "universe" not in self._config:
             logger.warning("No universe section in config, returning empty list")
@@ -169,6 +174,12 @@ class ConfigManager:
             logger.warning(f"Universe file {symbols_file} not found, returning empty list")
             return []
 
+        # Memoized on (path, mtime): re-read only when the file changes
+        cache_key = (str(symbols_path.resolve()), symbols_path.stat().st_mtime_ns)
+        cached = self._universe_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
         symbols = []
         with open(symbols_path) as f:
             for line in f:
@@ -176,8 +187,9 @@ class ConfigManager:
                 if line and not line.startswith("#"):
                     symbols.append(line.upper())
 
+        self._universe_cache = {cache_key: symbols}
         logger.info(f"Loaded {len(symbols)} symbols from {symbols_file}")
-        return symbols
+        return list(symbols)
 
     # Reddit API credentials
     @property
@@ -199,13 +211,29 @@ class ConfigManager:
 
     # Rate limiting
     @property
-    def api_rate_limit_delay(self) -> float:
-        return float(os.getenv("API_RATE_LIMIT_DELAY", "1.0"))
+    def coingecko_calls_per_minute(self) -> int:
+        # Free tier allows roughly 30 calls/minute; stay a little under it
+        return int(os.getenv("COINGECKO_CALLS_PER_MINUTE", "25"))
+
+    @property
+    def binance_calls_per_minute(self) -> int:
+        # Public market-data endpoints are weight-limited per IP; 10
+        # requests/second leaves ample headroom
+        return int(os.getenv("BINANCE_CALLS_PER_MINUTE", "600"))
+
+    @property
+    def api_rate_limit_concurrency(self) -> int:
+        return int(os.getenv("API_RATE_LIMIT_CONCURRENCY", "3"))
 
     @property
     def max_retries(self) -> int:
         return int(os.getenv("MAX_RETRIES", "3"))
 
+    # HTTP response cache (used when requests-cache is installed)
+    @property
+    def http_cache_path(self) -> str:
+        return os.getenv("HTTP_CACHE_PATH", "data/http_cache")
+
 
 # Global config instance
 _config = None
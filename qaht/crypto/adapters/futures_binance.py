@@ -3,15 +3,18 @@ Binance Futures API adapter for funding rates and open interest
 Public endpoints, no API key required
 """
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
-import time
 import logging
 
 from ...db import session_scope
 from ...schemas import FuturesMetrics
 from ...utils.retry import retry_with_backoff
+from ...utils.rate_limit import RateLimiter
+from ...utils.serialization import parse_response
+from ...utils.parallel import parallel_map, process_concurrently
 from ...config import get_config
 
 logger = logging.getLogger("qaht.adapters.binance_futures")
@@ -32,29 +35,86 @@ SYMBOL_MAP = {
     'LINK': 'LINKUSDT',
 }
 
+_LIMITER = RateLimiter(calls=config.binance_calls_per_minute, period=60.0)
+
+# Shared session: keep-alive reuses the TCP/TLS connection across calls
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+_SESSION.headers.update({
+    'User-Agent': 'QuantumAlphaHunter/1.0',
+    'Accept': 'application/json'
+})
+
 
 @retry_with_backoff(max_retries=3, initial_delay=1.0)
-def fetch_funding_rate(symbol: str) -> Optional[float]:
+def _get_endpoint(endpoint: str, symbol: str) -> Dict:
     """
-    Fetch current funding rate for a perpetual futures contract
+    GET a public futures endpoint for a single symbol
 
     Args:
+        endpoint: Path relative to BINANCE_FUTURES_BASE (e.g., 'premiumIndex')
         symbol: Binance futures symbol (e.g., 'BTCUSDT')
 
     Returns:
-        Current funding rate (as decimal, e.g., 0.0001 = 0.01%)
+        Decoded JSON body
     """
-    url = f"{BINANCE_FUTURES_BASE}/premiumIndex"
+    url = f"{BINANCE_FUTURES_BASE}/{endpoint}"
     params = {'symbol': symbol}
 
-    response = requests.get(url, params=params, timeout=10)
+    _LIMITER.acquire()
+    response = _SESSION.get(url, params=params, timeout=10)
     response.raise_for_status()
 
-    data = response.json()
+    return parse_response(response)
+
+
+def _get_endpoints(endpoints: List[str], symbol: str) -> List[Dict]:
+    """
+    GET several independent endpoints for one symbol concurrently
+
+    Wall time is one round-trip instead of one per endpoint. Each request
+    keeps its own retry/backoff.
+
+    Args:
+        endpoints: Paths relative to BINANCE_FUTURES_BASE
+        symbol: Binance futures symbol (e.g., 'BTCUSDT')
+
+    Returns:
+        Decoded JSON bodies, in endpoint order
+    """
+    return parallel_map(
+        lambda endpoint: _get_endpoint(endpoint, symbol),
+        endpoints,
+        max_workers=len(endpoints)
+    )
+
+
+def _open_interest_usd(open_interest: Dict, ticker: Dict) -> Dict:
+    """Open interest in contracts and USD from openInterest and ticker/price bodies"""
+    price = float(ticker['price'])
+    oi_contracts = float(open_interest['openInterest'])
+
+    return {
+        'oi': oi_contracts,
+        'oi_usd': oi_contracts * price,
+        'price': price
+    }
+
+
+def fetch_funding_rate(symbol: str) -> Optional[float]:
+    """
+    Fetch current funding rate for a perpetual futures contract
+
+    Args:
+        symbol: Binance futures symbol (e.g., 'BTCUSDT')
+
+    Returns:
+        Current funding rate (as decimal, e.g., 0.0001 = 0.01%)
+    """
+    data = _get_endpoint('premiumIndex', symbol)
     return float(data['lastFundingRate'])
 
 
-@retry_with_backoff(max_retries=3, initial_delay=1.0)
 def fetch_open_interest(symbol: str) -> Dict:
     """
     Fetch current open interest
@@ -65,27 +125,26 @@ def fetch_open_interest(symbol: str) -> Dict:
     Returns:
         Dict with open interest in contracts and USD value
     """
-    url = f"{BINANCE_FUTURES_BASE}/openInterest"
-    params = {'symbol': symbol}
+    # Price is needed for the USD value; fetch both at once
+    open_interest, ticker = _get_endpoints(['openInterest', 'ticker/price'], symbol)
+    return _open_interest_usd(open_interest, ticker)
 
-    response = requests.get(url, params=params, timeout=10)
-    response.raise_for_status()
 
-    data = response.json()
+def fetch_symbol_metrics(symbol: str) -> Dict:
+    """
+    Fetch funding rate, open interest and price for one contract
 
-    # Get current price to calculate USD value
-    price_url = f"{BINANCE_FUTURES_BASE}/ticker/price"
-    price_response = requests.get(price_url, params=params, timeout=10)
-    price_data = price_response.json()
-    price = float(price_data['price'])
+    Args:
+        symbol: Binance futures symbol (e.g., 'BTCUSDT')
 
-    oi_contracts = float(data['openInterest'])
-    oi_usd = oi_contracts * price
+    Returns:
+        Dict with funding_rate, oi, oi_usd and price
+    """
+    premium, open_interest, ticker = _get_endpoints(['premiumIndex', 'openInterest', 'ticker/price'], symbol)
 
     return {
-        'oi': oi_contracts,
-        'oi_usd': oi_usd,
-        'price': price
+        'funding_rate': float(premium['lastFundingRate']),
+        **_open_interest_usd(open_interest, ticker)
     }
 
 
@@ -99,33 +158,40 @@ def fetch_futures_metrics(symbols: List[str]) -> pd.DataFrame:
     Returns:
         DataFrame with futures metrics
     """
-    results = []
     today = datetime.now().strftime('%Y-%m-%d')
 
-    for symbol in symbols:
-        binance_symbol = SYMBOL_MAP.get(symbol.upper())
+    def fetch_symbol(symbol):
+        symbol = symbol.upper()
+        binance_symbol = SYMBOL_MAP.get(symbol)
 
         if not binance_symbol:
             logger.warning(f"No Binance futures mapping for {symbol}")
-            continue
+            return None
 
         try:
-            funding_rate = fetch_funding_rate(binance_symbol)
-            oi_data = fetch_open_interest(binance_symbol)
-
-            results.append({
-                'symbol': symbol.upper(),
-                'date': today,
-                'funding_rate': funding_rate,
-                'oi': oi_data['oi'],
-                'oi_usd': oi_data['oi_usd'],
-                'basis_pct': None  # Can calculate if we have spot price
-            })
-
-            time.sleep(config.api_rate_limit_delay * 0.5)  # Binance allows more requests
-
+            metrics = fetch_symbol_metrics(binance_symbol)
         except Exception as e:
             logger.error(f"Failed to fetch futures metrics for {symbol}: {e}")
+            return None
+
+        return {
+            'symbol': symbol,
+            'date': today,
+            'funding_rate': metrics['funding_rate'],
+            'oi': metrics['oi'],
+            'oi_usd': metrics['oi_usd'],
+            'basis_pct': None  # Can calculate if we have spot price
+        }
+
+    # Symbols are independent; the shared limiter paces the combined request rate
+    rows = process_concurrently(
+        symbols,
+        fetch_symbol,
+        max_workers=config.api_rate_limit_concurrency,
+        description="Fetching futures metrics",
+        show_progress=False
+    )
+    results = [row for row in rows if row is not None]
 
     if not results:
         return pd.DataFrame()
@@ -3,16 +3,30 @@ CoinGecko API adapter for crypto spot prices
 Free tier: 10-30 calls/minute (no API key needed)
 """
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
+import numpy as np
 from typing import List, Optional, Dict
-from datetime import datetime
-import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+import threading
 import logging
 
-from ...db import session_scope
+from ...db import session_scope, bulk_upsert
 from ...schemas import PriceOHLC
 from ...utils.retry import retry_with_backoff
+from ...utils.rate_limit import RateLimiter
+from ...utils.serialization import parse_response
+from ...utils.parallel import process_concurrently
 from ...config import get_config
+from sqlalchemy import select, func
+
+try:
+    from requests_cache import CachedSession
+    HAS_REQUESTS_CACHE = True
+except ImportError:
+    HAS_REQUESTS_CACHE = False
+    logging.warning("requests-cache not available, CoinGecko responses will not be cached")
 
 logger = logging.getLogger("qaht.adapters.coingecko")
 config = get_config()
@@ -37,6 +51,82 @@ SYMBOL_MAP = {
 ID_MAP = {v: k for k, v in SYMBOL_MAP.items()}
 
 
+@lru_cache(maxsize=None)
+def symbol_to_id(symbol: str) -> Optional[str]:
+    """Map a ticker symbol (e.g., 'btc') to its CoinGecko ID, or None"""
+    return ID_MAP.get(symbol.upper())
+
+
+_LIMITER = RateLimiter(calls=config.coingecko_calls_per_minute, period=60.0)
+
+
+class _RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that takes a limiter token before each request hits the network"""
+
+    def send(self, request, **kwargs):
+        _LIMITER.acquire()
+        return super().send(request, **kwargs)
+
+
+def map_coin_ids(symbols: List[str]) -> List[str]:
+    """
+    Resolve symbols to CoinGecko IDs, dropping (and logging once) unknown ones
+
+    Args:
+        symbols: List of symbols (e.g., ['BTC', 'ETH', 'SOL'])
+
+    Returns:
+        CoinGecko IDs in input order
+    """
+    pairs = [(symbol, symbol_to_id(symbol)) for symbol in symbols]
+    unknown = [symbol for symbol, coin_id in pairs if coin_id is None]
+
+    if unknown:
+        logger.warning(f"No CoinGecko mapping for {', '.join(unknown)}")
+
+    return [coin_id for _, coin_id in pairs if coin_id is not None]
+
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """
+    Shared session, created on first use
+
+    Keep-alive reuses the TCP/TLS connection across calls. With
+    requests-cache, reruns replay cached bodies (revalidated via
+    ETag/Last-Modified when the server supports it) without touching the
+    network or the rate limiter; stale entries are served if the API errors.
+    Built lazily so importing this module never creates the cache file.
+    """
+    global _SESSION
+
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            if HAS_REQUESTS_CACHE:
+                session = CachedSession(
+                    config.http_cache_path,
+                    backend='sqlite',
+                    expire_after=timedelta(hours=6),
+                    urls_expire_after={'api.coingecko.com/api/v3/coins/markets': timedelta(minutes=5)},
+                    cache_control=True,
+                    stale_if_error=True
+                )
+            else:
+                session = requests.Session()
+
+            session.mount("https://", _RateLimitedAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+            session.headers.update({
+                'User-Agent': 'QuantumAlphaHunter/1.0',
+                'Accept': 'application/json'
+            })
+            _SESSION = session
+
+    return _SESSION
+
+
 @retry_with_backoff(max_retries=3, initial_delay=2.0)
 def fetch_coingecko_ohlc(coin_id: str, days: int = 90) -> pd.DataFrame:
     """
@@ -57,19 +147,21 @@ def fetch_coingecko_ohlc(coin_id: str, days: int = 90) -> pd.DataFrame:
 
     logger.debug(f"Fetching CoinGecko OHLC for {coin_id}")
 
-    response = requests.get(url, params=params, timeout=10)
+    response = _get_session().get(url, params=params, timeout=10)
     response.raise_for_status()
 
-    data = response.json()
+    data = parse_response(response)
 
     if not data:
         logger.warning(f"No OHLC data for {coin_id}")
         return pd.DataFrame()
 
     # Data format: [[timestamp_ms, open, high, low, close], ...]
-    df = pd.DataFrame(data, columns=['timestamp', 'open', 'high', 'low', 'close'])
-    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-    df['date'] = df['timestamp'].dt.strftime('%Y-%m-%d')
+    values = np.asarray(data, dtype=np.float64)
+    timestamps = pd.to_datetime(values[:, 0].astype(np.int64), unit='ms')
+
+    df = pd.DataFrame(values[:, 1:], columns=['open', 'high', 'low', 'close'])
+    df['date'] = timestamps.strftime('%Y-%m-%d')
     df['symbol'] = SYMBOL_MAP.get(coin_id, coin_id.upper())
 
     # CoinGecko doesn't provide volume in OHLC endpoint, fetch separately
@@ -77,9 +169,6 @@ def fetch_coingecko_ohlc(coin_id: str, days: int = 90) -> pd.DataFrame:
 
     df = df[['symbol', 'date', 'open', 'high', 'low', 'close', 'volume']]
 
-    # Rate limiting
-    time.sleep(config.api_rate_limit_delay)
-
     return df
 
 
@@ -104,35 +193,40 @@ def fetch_coingecko_market_data(coin_ids: List[str]) -> pd.DataFrame:
         'sparkline': False
     }
 
-    response = requests.get(url, params=params, timeout=10)
+    response = _get_session().get(url, params=params, timeout=10)
     response.raise_for_status()
 
-    data = response.json()
+    data = parse_response(response)
 
     if not data:
         return pd.DataFrame()
 
-    results = []
-    for coin in data:
-        results.append({
-            'symbol': SYMBOL_MAP.get(coin['id'], coin['symbol'].upper()),
-            'date': datetime.now().strftime('%Y-%m-%d'),
-            'open': coin['current_price'],  # Approximation
-            'high': coin['high_24h'] or coin['current_price'],
-            'low': coin['low_24h'] or coin['current_price'],
-            'close': coin['current_price'],
-            'volume': coin['total_volume'] or 0.0
-        })
-
-    time.sleep(config.api_rate_limit_delay)
-
-    return pd.DataFrame(results)
+    coins = pd.DataFrame.from_records(
+        data, columns=['id', 'symbol', 'current_price', 'high_24h', 'low_24h', 'total_volume']
+    )
+    price = pd.to_numeric(coins['current_price'], errors='coerce')
+    high = pd.to_numeric(coins['high_24h'], errors='coerce')
+    low = pd.to_numeric(coins['low_24h'], errors='coerce')
+
+    # Missing or zero 24h high/low fall back to the current price
+    return pd.DataFrame({
+        'symbol': coins['id'].map(SYMBOL_MAP).fillna(coins['symbol'].str.upper()),
+        'date': datetime.now().strftime('%Y-%m-%d'),
+        'open': price,  # Approximation
+        'high': high.where(high.fillna(0) != 0, price),
+        'low': low.where(low.fillna(0) != 0, price),
+        'close': price,
+        'volume': pd.to_numeric(coins['total_volume'], errors='coerce').fillna(0.0)
+    })
 
 
 def fetch_crypto_prices(symbols: List[str], days: int = 90) -> pd.DataFrame:
     """
     Fetch historical prices for crypto symbols
 
+    Symbols are fetched concurrently (bounded by api_rate_limit_concurrency),
+    since each call is almost entirely network wait.
+
     Args:
         symbols: List of symbols (e.g., ['BTC', 'ETH', 'SOL'])
         days: Number of days of history
@@ -140,32 +234,54 @@ def fetch_crypto_prices(symbols: List[str], days: int = 90) -> pd.DataFrame:
     Returns:
         Combined DataFrame with OHLC data
     """
-    results = []
+    coin_ids = map_coin_ids(symbols)
 
-    for symbol in symbols:
-        # Map symbol to CoinGecko ID
-        coin_id = ID_MAP.get(symbol.upper())
+    frames = process_concurrently(
+        coin_ids,
+        lambda coin_id: fetch_coingecko_ohlc(coin_id, days),
+        max_workers=config.api_rate_limit_concurrency,
+        description="Fetching crypto prices",
+        show_progress=False
+    )
 
-        if not coin_id:
-            logger.warning(f"No CoinGecko mapping for {symbol}")
-            continue
-
-        try:
-            df = fetch_coingecko_ohlc(coin_id, days)
-            if not df.empty:
-                results.append(df)
-        except Exception as e:
-            logger.error(f"Failed to fetch {symbol}: {e}")
+    results = [df for df in frames if df is not None and not df.empty]
 
     if not results:
         return pd.DataFrame()
 
     combined = pd.concat(results, ignore_index=True)
+    # Few distinct symbols repeated per candle: store as codes + one dictionary
+    combined['symbol'] = combined['symbol'].astype('category')
     logger.info(f"Fetched {len(combined)} rows for {len(results)} crypto symbols")
 
     return combined
 
 
+def fetch_crypto_prices_batched(symbols: List[str]) -> pd.DataFrame:
+    """
+    Fetch today's price snapshot for all symbols in a single request
+
+    /coins/markets accepts a comma-separated id list, so N symbols cost one
+    call instead of N. Only the current day is returned; use
+    fetch_crypto_prices for historical backfill.
+
+    Args:
+        symbols: List of symbols (e.g., ['BTC', 'ETH', 'SOL'])
+
+    Returns:
+        DataFrame with one OHLC row per symbol for today
+    """
+    coin_ids = map_coin_ids(symbols)
+
+    if not coin_ids:
+        return pd.DataFrame()
+
+    df = fetch_coingecko_market_data(coin_ids)
+    logger.info(f"Fetched market snapshot for {len(df)} crypto symbols")
+
+    return df
+
+
 def upsert_crypto_prices(df: pd.DataFrame):
     """
     Insert or update crypto price data in database
@@ -177,47 +293,77 @@ def upsert_crypto_prices(df: pd.DataFrame):
         logger.warning("Empty DataFrame passed to upsert_crypto_prices")
         return
 
+    price_columns = ['open', 'high', 'low', 'close', 'volume']
+
+    # Intraday candles share a date; keep the latest so each key appears once
+    records = (
+        df[['symbol', 'date'] + price_columns]
+        .drop_duplicates(subset=['symbol', 'date'], keep='last')
+        .astype({column: float for column in price_columns})
+        .assign(asset_type='crypto')
+        .to_dict(orient='records')
+    )
+
     with session_scope() as session:
-        inserted = 0
-        updated = 0
-
-        for _, row in df.iterrows():
-            existing = session.get(PriceOHLC, (row['symbol'], row['date']))
-
-            if existing:
-                existing.open = float(row['open'])
-                existing.high = float(row['high'])
-                existing.low = float(row['low'])
-                existing.close = float(row['close'])
-                existing.volume = float(row['volume'])
-                updated += 1
-            else:
-                price = PriceOHLC(
-                    symbol=row['symbol'],
-                    date=row['date'],
-                    open=float(row['open']),
-                    high=float(row['high']),
-                    low=float(row['low']),
-                    close=float(row['close']),
-                    volume=float(row['volume']),
-                    asset_type='crypto'
-                )
-                session.add(price)
-                inserted += 1
+        written = bulk_upsert(session, PriceOHLC, records, update_columns=price_columns)
+
+    logger.info(f"Upserted {written} crypto price rows")
 
-        logger.info(f"Upserted crypto prices: {inserted} inserted, {updated} updated")
+
+def symbols_needing_backfill(symbols: List[str]) -> List[str]:
+    """
+    Symbols whose stored price history does not reach yesterday
+
+    Those need the per-coin OHLC history; the rest are current enough for
+    today's batched snapshot to extend them.
+
+    Args:
+        symbols: List of crypto symbols
+
+    Returns:
+        Upper-cased symbols to backfill, in input order
+    """
+    symbols = [symbol.upper() for symbol in symbols]
+    yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+
+    with session_scope() as session:
+        current = set(session.execute(
+            select(PriceOHLC.symbol)
+            .where(PriceOHLC.symbol.in_(symbols))
+            .group_by(PriceOHLC.symbol)
+            .having(func.max(PriceOHLC.date) >= yesterday)
+        ).scalars())
+
+    return [symbol for symbol in symbols if symbol not in current]
 
 
 def fetch_and_upsert_crypto(symbols: List[str], days: int = 90):
     """
     Convenience function: fetch and upsert crypto prices
 
+    Symbols with up-to-date history get today's row from one batched
+    /coins/markets call; only new or stale symbols are backfilled with
+    per-coin OHLC requests.
+
     Args:
         symbols: List of crypto symbols
-        days: Number of days of history
+        days: Days of history to backfill for new or stale symbols
     """
-    df = fetch_crypto_prices(symbols, days)
-    if not df.empty:
-        upsert_crypto_prices(df)
-        return len(df)
-    return 0
+    backfill = symbols_needing_backfill(symbols)
+    backfill_set = set(backfill)
+    current = [symbol.upper() for symbol in symbols if symbol.upper() not in backfill_set]
+
+    frames = []
+    if current:
+        frames.append(fetch_crypto_prices_batched(current))
+    if backfill:
+        logger.info(f"Backfilling {days}d of history for {len(backfill)} crypto symbols")
+        frames.append(fetch_crypto_prices(backfill, days))
+
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return 0
+
+    df = pd.concat(frames, ignore_index=True)
+    upsert_crypto_prices(df)
+    return len(df)
@@ -7,7 +7,7 @@ import numpy as np
 from typing import Dict
 import logging
 
-from ...db import session_scope
+from ...db import session_scope, bulk_upsert
 from ...schemas import FuturesMetrics, Factors
 from ...config import get_config
 from sqlalchemy import select
@@ -15,6 +15,44 @@ from sqlalchemy import select
 logger = logging.getLogger("qaht.features.crypto_derivatives")
 config = get_config()
 
+# Row layout for streamed futures history; dates stay ISO strings
+# (YYYY-MM-DD), the same form Factors keys on, so no datetime round-trip
+_HISTORY_DTYPE = np.dtype([
+    ('date', 'U10'),
+    ('funding_rate', np.float64),
+    ('oi_usd', np.float64)
+])
+
+
+def _cumulative(values: np.ndarray):
+    """
+    Prefix sums of values (NaN counted as 0) and of valid-value counts
+
+    Returns:
+        (sums, counts), each of length len(values) + 1 with a leading 0
+    """
+    valid = ~np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    return sums, counts
+
+
+def _rolling_mean(sums: np.ndarray, counts: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing mean from prefix sums in O(N)
+
+    Matches pandas `rolling(window, min_periods=window).mean()`: the first
+    window - 1 entries, and any window containing NaN, are NaN.
+    """
+    n = len(sums) - 1
+    means = np.full(n, np.nan)
+
+    if n >= window:
+        full = (counts[window:] - counts[:-window]) == window
+        means[window - 1:] = np.where(full, (sums[window:] - sums[:-window]) / window, np.nan)
+
+    return means
+
 
 def compute_funding_rate_delta(symbol: str, window: int = 7):
     """
@@ -30,31 +68,25 @@ def compute_funding_rate_delta(symbol: str, window: int = 7):
         window: Rolling window for delta
     """
     with session_scope() as session:
-        # Get futures metrics history
-        metrics = session.execute(
-            select(FuturesMetrics)
+        # Stream futures history in chunks straight into one structured array
+        result = session.execute(
+            select(FuturesMetrics.date, FuturesMetrics.funding_rate, FuturesMetrics.oi_usd)
             .where(FuturesMetrics.symbol == symbol)
             .order_by(FuturesMetrics.date)
-        ).scalars().all()
+            .execution_options(yield_per=1000)
+        )
+        history = np.fromiter(map(tuple, result), dtype=_HISTORY_DTYPE)
 
-        if len(metrics) < 30:
+        if len(history) < 30:
             logger.debug(f"Insufficient futures history for {symbol}")
             return
 
-        # Convert to DataFrame
-        df = pd.DataFrame([{
-            'date': m.date,
-            'funding_rate': m.funding_rate,
-            'oi': m.oi,
-            'oi_usd': m.oi_usd
-        } for m in metrics])
-
-        df['date'] = pd.to_datetime(df['date'])
-        df = df.sort_values('date')
+        df = pd.DataFrame(history)
 
-        # Funding rate delta (7d vs 30d average)
-        df['funding_7d'] = df['funding_rate'].rolling(window=window, min_periods=window).mean()
-        df['funding_30d'] = df['funding_rate'].rolling(window=30, min_periods=30).mean()
+        # Funding rate delta (7d vs 30d average), both from one cumulative sum
+        funding_sums, funding_counts = _cumulative(history['funding_rate'])
+        df['funding_7d'] = _rolling_mean(funding_sums, funding_counts, window)
+        df['funding_30d'] = _rolling_mean(funding_sums, funding_counts, 30)
 
         # Delta: change in funding bias
         df['funding_rate_delta_7d'] = df['funding_7d'] - df['funding_30d']
@@ -62,29 +94,16 @@ def compute_funding_rate_delta(symbol: str, window: int = 7):
         # Open interest delta
         df['oi_delta_7d'] = df['oi_usd'].pct_change(periods=window)
 
-        # Update Factors table
-        for _, row in df.dropna(subset=['funding_rate_delta_7d']).iterrows():
-            date_str = row['date'].strftime('%Y-%m-%d')
-
-            factor = session.get(Factors, (symbol, date_str))
-
-            if not factor:
-                # Create new if missing
-                factor = Factors(
-                    symbol=symbol,
-                    date=date_str,
-                    bb_width_pct=None,
-                    ma_spread_pct=None,
-                    social_delta_7d=None
-                )
-                session.add(factor)
-
-            # Update derivatives features (crypto-specific columns)
-            # Note: These need to be added to Factors schema
-            if pd.notna(row['funding_rate_delta_7d']):
-                # For now, store in existing columns as placeholder
-                # TODO: Add funding_rate_delta_7d, oi_delta_7d columns to schema
-                pass
+        # Update Factors table in one set-based upsert (NaN -> NULL)
+        features = (
+            df.dropna(subset=['funding_rate_delta_7d'])
+            .assign(symbol=symbol)
+            [['symbol', 'date', 'funding_rate_delta_7d', 'oi_delta_7d']]
+            .astype(object)
+        )
+        features = features.where(features.notna(), None)
+
+        bulk_upsert(session, Factors, features.to_dict(orient='records'), update_columns=['funding_rate_delta_7d', 'oi_delta_7d'])
 
         logger.debug(f"Updated derivatives features for {symbol}")
 
@@ -102,30 +121,28 @@ def detect_funding_reversal(symbol: str, threshold: float = 0.0001) -> bool:
         True if reversal detected
     """
     with session_scope() as session:
-        metrics = session.execute(
-            select(FuturesMetrics)
+        rows = session.execute(
+            select(FuturesMetrics.funding_rate)
             .where(FuturesMetrics.symbol == symbol)
             .order_by(FuturesMetrics.date.desc())
             .limit(14)
-        ).scalars().all()
+        ).all()
 
-        if len(metrics) < 7:
+        # Need at least one row past the 7-day gap for a historical average
+        if len(rows) < 8:
             return False
 
-        df = pd.DataFrame([{
-            'date': m.date,
-            'funding_rate': m.funding_rate
-        } for m in metrics])
+        rates = np.fromiter((row.funding_rate for row in rows), dtype=np.float64, count=len(rows))
 
-        # Check for sign change
-        recent_avg = df['funding_rate'].iloc[:3].mean()
-        historical_avg = df['funding_rate'].iloc[7:].mean()
+        # Check for sign change (NaN-skipping, like the pandas mean it replaces)
+        recent_avg = np.nanmean(rates[:3])
+        historical_avg = np.nanmean(rates[7:])
 
         # Reversal if signs differ and magnitude > threshold
-        if abs(recent_avg) > threshold and abs(historical_avg) > threshold:
-            if np.sign(recent_avg) != np.sign(historical_avg):
-                logger.info(f"Funding reversal detected for {symbol}: {historical_avg:.6f} → {recent_avg:.6f}")
-                return True
+        if (abs(recent_avg) > threshold and abs(historical_avg) > threshold
+                and np.signbit(recent_avg) != np.signbit(historical_avg)):
+            logger.info(f"Funding reversal detected for {symbol}: {historical_avg:.6f} → {recent_avg:.6f}")
+            return True
 
     return False
 
@@ -143,24 +160,22 @@ def compute_oi_momentum(symbol: str) -> Dict[str, float]:
         Dict with OI metrics
     """
     with session_scope() as session:
-        metrics = session.execute(
-            select(FuturesMetrics)
+        # Newest first: only the last 14 snapshots feed the change rates
+        oi_usd = session.execute(
+            select(FuturesMetrics.oi_usd)
             .where(FuturesMetrics.symbol == symbol)
-            .order_by(FuturesMetrics.date)
-            .limit(30)
+            .order_by(FuturesMetrics.date.desc())
+            .limit(14)
         ).scalars().all()
 
-        if len(metrics) < 14:
+        if len(oi_usd) < 14:
             return {}
 
-        df = pd.DataFrame([{
-            'date': m.date,
-            'oi_usd': m.oi_usd
-        } for m in metrics])
+        oi_usd = np.asarray(oi_usd, dtype=np.float64)
 
-        # OI change rates
-        oi_change_7d = (df['oi_usd'].iloc[-1] - df['oi_usd'].iloc[-7]) / df['oi_usd'].iloc[-7]
-        oi_change_14d = (df['oi_usd'].iloc[-1] - df['oi_usd'].iloc[-14]) / df['oi_usd'].iloc[-14]
+        # OI change rates (index 0 is the latest snapshot)
+        oi_change_7d = (oi_usd[0] - oi_usd[6]) / oi_usd[6]
+        oi_change_14d = (oi_usd[0] - oi_usd[13]) / oi_usd[13]
 
         return {
             'oi_change_7d': float(oi_change_7d),
@@ -8,7 +8,7 @@ from datetime import datetime
 
 from ...config import get_config
 from ...db import init_db
-from ...utils.parallel import process_concurrently
+from ...utils.parallel import process_concurrently, run_steps_concurrently
 from ...logging_conf import setup_logging
 
 from ..adapters.spot_coingecko import fetch_and_upsert_crypto
@@ -22,6 +22,9 @@ from ...scoring.ridge_model import train_and_score
 logger = setup_logging()
 config = get_config()
 
+# Bare tickers treated as crypto even without a -USD suffix
+KNOWN_CRYPTO = frozenset({'BTC', 'ETH', 'SOL', 'DOGE', 'SHIB'})
+
 
 def run(universe_csv: Optional[str] = None) -> dict:
     """
@@ -46,45 +49,33 @@ def run(universe_csv: Optional[str] = None) -> dict:
     else:
         all_symbols = config.get_universe_symbols()
         # Filter to crypto only (symbols ending in -USD or known crypto)
-        symbols = [s.replace('-USD', '') for s in all_symbols if '-USD' in s or s in ['BTC', 'ETH', 'SOL', 'DOGE', 'SHIB']]
+        symbols = [s.removesuffix('-USD') for s in all_symbols if s.endswith('-USD') or s in KNOWN_CRYPTO]
 
     logger.info(f"Starting crypto pipeline with {len(symbols)} symbols")
 
-    # Step 1: Fetch spot prices
-    step_start = time.time()
-    logger.info("Fetching crypto prices from CoinGecko...")
-
-    try:
-        price_count = fetch_and_upsert_crypto(symbols, days=90)
-        logger.info(f"Fetched {price_count} price rows")
-    except Exception as e:
-        logger.error(f"Price ingestion failed: {e}")
+    # Steps 1-3: Ingestion from CoinGecko, Binance and Reddit (independent hosts)
+    logger.info("Fetching prices (CoinGecko), futures metrics (Binance) and Reddit mentions...")
+    step_starts = {}
 
-    steps['price_ingestion'] = time.time() - step_start
+    def start_step(name):
+        step_starts[name] = time.time()
 
-    # Step 2: Fetch futures data (funding rates, OI)
-    step_start = time.time()
-    logger.info("Fetching futures metrics from Binance...")
-
-    try:
-        futures_count = fetch_and_upsert_futures(symbols)
-        logger.info(f"Fetched futures data for {futures_count} symbols")
-    except Exception as e:
-        logger.error(f"Futures ingestion failed: {e}")
+    def end_step(name):
+        steps[name] = time.time() - step_starts[name]
 
-    steps['futures_ingestion'] = time.time() - step_start
-
-    # Step 3: Fetch social data
-    step_start = time.time()
-    logger.info("Fetching Reddit mentions...")
-
-    try:
-        social_count = fetch_and_upsert_reddit(symbols, asset_type='crypto')
-        logger.info(f"Fetched social data for {social_count} symbols")
-    except Exception as e:
-        logger.error(f"Social ingestion failed: {e}")
-
-    steps['social_ingestion'] = time.time() - step_start
+    counts = run_steps_concurrently(
+        [
+            ('price_ingestion', lambda: fetch_and_upsert_crypto(symbols, days=90)),
+            ('futures_ingestion', lambda: fetch_and_upsert_futures(symbols)),
+            ('social_ingestion', lambda: fetch_and_upsert_reddit(symbols, asset_type='crypto')),
+        ],
+        on_start=start_step,
+        on_end=end_step
+    )
+    logger.info(
+        f"Fetched {counts['price_ingestion']} price rows, futures data for "
+        f"{counts['futures_ingestion']} symbols, social data for {counts['social_ingestion']} symbols"
+    )
 
     # Step 4: Compute technical features
     step_start = time.time()
@@ -7,9 +7,10 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
-import json
+import heapq
 
 from ..db import session_scope
+from ..utils.serialization import loads
 from ..schemas import Predictions, Factors, Labels, PriceOHLC
 from sqlalchemy import select, desc
 
@@ -44,44 +45,55 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-def load_watchlist(min_score: int = 70):
-    """Load latest predictions"""
-    with session_scope() as session:
-        predictions = session.execute(
-            select(Predictions)
-            .where(Predictions.quantum_score >= min_score)
-            .order_by(desc(Predictions.quantum_score), desc(Predictions.date))
-        ).scalars().all()
+def top_signals(components_json: str, n: int = 3) -> str:
+    """Names of the n strongest components in a prediction's JSON blob"""
+    try:
+        components = loads(components_json) if components_json else {}
+    except (ValueError, TypeError):
+        components = {}
 
-        if not predictions:
-            return pd.DataFrame()
+    # Partial selection, no full sort; missing values (null) are skipped
+    scored = ((k, v) for k, v in components.items() if v is not None)
+    top_features = heapq.nlargest(n, scored, key=lambda x: abs(x[1]))
+    return ", ".join([f"{k}" for k, v in top_features])
 
-        data = []
-        for p in predictions:
-            # Parse components
-            try:
-                components = json.loads(p.components) if p.components else {}
-            except:
-                components = {}
 
-            # Get top 3 features
-            top_features = sorted(components.items(), key=lambda x: abs(x[1]), reverse=True)[:3]
-            top_features_str = ", ".join([f"{k}" for k, v in top_features])
+@st.cache_data(ttl=60, show_spinner=False)
+def load_watchlist(min_score: int = 70):
+    """Load latest predictions (cached per min_score for 60s)"""
+    stmt = (
+        select(
+            Predictions.symbol,
+            Predictions.date,
+            Predictions.quantum_score,
+            Predictions.conviction_level,
+            Predictions.prob_hit_10d,
+            Predictions.components
+        )
+        .where(Predictions.quantum_score >= min_score)
+        .order_by(desc(Predictions.quantum_score), desc(Predictions.date))
+    )
+
+    # Read rows straight into columns, no ORM objects
+    with session_scope() as session:
+        predictions = pd.read_sql_query(stmt, session.bind)
 
-            data.append({
-                'Symbol': p.symbol,
-                'Date': p.date,
-                'Score': p.quantum_score,
-                'Conviction': p.conviction_level,
-                'Probability': f"{p.prob_hit_10d:.1%}",
-                'Top Signals': top_features_str
-            })
+    if predictions.empty:
+        return pd.DataFrame()
 
-        return pd.DataFrame(data)
+    return pd.DataFrame({
+        'Symbol': predictions['symbol'],
+        'Date': predictions['date'],
+        'Score': predictions['quantum_score'],
+        'Conviction': predictions['conviction_level'],
+        'Probability': predictions['prob_hit_10d'].map('{:.1%}'.format),
+        'Top Signals': predictions['components'].map(top_signals)
+    })
 
 
+@st.cache_data(ttl=60, show_spinner=False)
 def load_symbol_details(symbol: str):
-    """Load detailed info for a symbol"""
+    """Load detailed info for a symbol (cached per symbol for 60s)"""
     with session_scope() as session:
         # Latest prediction
         pred = session.execute(
@@ -100,16 +112,88 @@ def load_symbol_details(symbol: str):
         ).scalar_one_or_none()
 
         # Price history
-        prices = session.execute(
-            select(PriceOHLC)
+        prices = pd.read_sql_query(
+            select(PriceOHLC.date, PriceOHLC.close, PriceOHLC.volume)
             .where(PriceOHLC.symbol == symbol)
             .order_by(PriceOHLC.date)
-            .limit(252)
-        ).scalars().all()
+            .limit(252),
+            session.bind
+        )
 
         return pred, factors, prices
 
 
+@st.cache_data(ttl=60, show_spinner=False)
+def load_symbols():
+    """Load all symbols with predictions"""
+    with session_scope() as session:
+        return session.execute(
+            select(Predictions.symbol).distinct()
+        ).scalars().all()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_performance():
+    """
+    Load realized performance of past predictions
+
+    Hit rates and bucket returns are aggregated in SQL, so only one row per
+    group (plus the raw scores for the histogram) leaves the database.
+
+    Returns:
+        (conviction_perf, bucket_perf, scores) DataFrames
+    """
+    labeled = """
+        FROM predictions p
+        JOIN labels l ON p.symbol = l.symbol AND p.date = l.date
+        WHERE l.fwd_ret_10d IS NOT NULL
+    """
+
+    with session_scope() as session:
+        # Hit rate by conviction (cast first: PostgreSQL has no SUM/AVG
+        # over booleans)
+        conviction_perf = pd.read_sql(f"""
+            SELECT
+                p.conviction_level,
+                COUNT(l.explosive_10d) AS count,
+                SUM(CAST(l.explosive_10d AS INTEGER)) AS sum,
+                AVG(CAST(l.explosive_10d AS INTEGER)) AS mean
+            {labeled}
+            GROUP BY p.conviction_level
+        """, session.bind, index_col='conviction_level')
+
+        # Forward returns by score bucket; std is derived from the sums below
+        # since SQLite has no STDDEV aggregate
+        bucket_perf = pd.read_sql(f"""
+            SELECT
+                CASE
+                    WHEN p.quantum_score < 70 THEN '<70'
+                    WHEN p.quantum_score < 80 THEN '70-79'
+                    WHEN p.quantum_score < 90 THEN '80-89'
+                    WHEN p.quantum_score < 100 THEN '90-99'
+                    ELSE '100'
+                END AS score_bucket,
+                COUNT(l.fwd_ret_10d) AS count,
+                AVG(l.fwd_ret_10d) AS mean,
+                SUM(l.fwd_ret_10d * l.fwd_ret_10d) AS sum_sq,
+                SUM(l.fwd_ret_10d) AS sum
+            {labeled}
+            GROUP BY score_bucket
+            ORDER BY MIN(p.quantum_score)
+        """, session.bind, index_col='score_bucket')
+
+        # Raw scores for the histogram only
+        scores = pd.read_sql(f"SELECT p.quantum_score {labeled}", session.bind)
+
+    # Sample standard deviation, as pandas .std() computes it
+    counts = bucket_perf['count']
+    variance = (bucket_perf['sum_sq'] - bucket_perf['sum'] ** 2 / counts) / (counts - 1)
+    bucket_perf['std'] = variance.clip(lower=0) ** 0.5
+    bucket_perf = bucket_perf[['count', 'mean', 'std']]
+
+    return conviction_perf.round(3), bucket_perf.round(3), scores
+
+
 # Sidebar
 st.sidebar.title("🚀 Quantum Alpha Hunter")
 st.sidebar.markdown("---")
@@ -157,10 +241,7 @@ elif page == "Symbol Analysis":
     st.title("🔍 Symbol Deep Dive")
 
     # Symbol selector
-    with session_scope() as session:
-        symbols = session.execute(
-            select(Predictions.symbol).distinct()
-        ).scalars().all()
+    symbols = load_symbols()
 
     if not symbols:
         st.warning("No symbols found. Run pipeline first.")
@@ -185,12 +266,8 @@ elif page == "Symbol Analysis":
                 st.markdown("---")
 
                 # Price chart
-                if prices:
-                    df_prices = pd.DataFrame([{
-                        'date': p.date,
-                        'close': p.close,
-                        'volume': p.volume
-                    } for p in prices])
+                if not prices.empty:
+                    df_prices = prices
 
                     fig = go.Figure()
                     fig.add_trace(go.Scatter(
@@ -231,42 +308,18 @@ elif page == "Symbol Analysis":
 elif page == "Performance":
     st.title("📈 System Performance")
 
-    with session_scope() as session:
-        # Get predictions with labels
-        query = """
-            SELECT
-                p.symbol,
-                p.date,
-                p.quantum_score,
-                p.conviction_level,
-                l.fwd_ret_10d,
-                l.explosive_10d
-            FROM predictions p
-            JOIN labels l ON p.symbol = l.symbol AND p.date = l.date
-            WHERE l.fwd_ret_10d IS NOT NULL
-        """
-
-        df = pd.read_sql(query, session.bind)
+    conviction_perf, bucket_perf, scores = load_performance()
 
-    if df.empty:
+    if scores.empty:
         st.warning("No performance data available yet")
     else:
-        # Calculate hit rate by conviction
-        conviction_perf = df.groupby('conviction_level').agg({
-            'explosive_10d': ['count', 'sum', 'mean']
-        }).round(3)
-
         st.subheader("Hit Rate by Conviction Level")
         st.dataframe(conviction_perf)
 
         # Score distribution
-        fig = px.histogram(df, x='quantum_score', nbins=20, title="Score Distribution")
+        fig = px.histogram(scores, x='quantum_score', nbins=20, title="Score Distribution")
         st.plotly_chart(fig, use_container_width=True)
 
-        # Returns by score bucket
-        df['score_bucket'] = pd.cut(df['quantum_score'], bins=[0, 70, 80, 90, 100], labels=['70-79', '80-89', '90-99', '100'])
-        bucket_perf = df.groupby('score_bucket')['fwd_ret_10d'].agg(['count', 'mean', 'std']).round(3)
-
         st.subheader("Returns by Score Bucket")
         st.dataframe(bucket_perf)
 
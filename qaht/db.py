@@ -4,7 +4,9 @@ Fixes: WAL mode, busy timeout, composite primary key handling
 """
 import os
 import threading
-from sqlalchemy import create_engine, event
+import uuid
+from typing import Any, Dict, List
+from sqlalchemy import create_engine, event, inspect, text, Column, MetaData, Table, and_, exists, insert, select, update
 from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy.pool import StaticPool, NullPool
 from contextlib import contextmanager
@@ -18,6 +20,15 @@ logger = logging.getLogger("qaht.db")
 config = get_config()
 _local = threading.local()
 
+# Stay under SQLite's default 32766 host-parameter limit per statement
+_MAX_BIND_PARAMS = 32000
+
+# Explicit migrations: nullable columns added to existing tables after they
+# were first created (create_all never alters a table that already exists)
+COLUMN_MIGRATIONS = {
+    "factors": ["funding_rate_delta_7d", "oi_delta_7d"],
+}
+
 
 class DatabaseManager:
     """
@@ -84,8 +95,34 @@ class DatabaseManager:
     def init_db(self):
         """Initialize database tables"""
         Base.metadata.create_all(self.engine)
+        self._migrate_columns()
         logger.info("Database tables initialized")
 
+    def _migrate_columns(self):
+        """
+        Add any COLUMN_MIGRATIONS columns missing from existing tables
+
+        Idempotent: columns already present are left alone.
+        """
+        inspector = inspect(self.engine)
+        preparer = self.engine.dialect.identifier_preparer
+
+        with self.engine.begin() as conn:
+            for table_name, column_names in COLUMN_MIGRATIONS.items():
+                existing = {column['name'] for column in inspector.get_columns(table_name)}
+                table = Base.metadata.tables[table_name]
+
+                for name in column_names:
+                    if name in existing:
+                        continue
+
+                    column_type = table.c[name].type.compile(dialect=self.engine.dialect)
+                    conn.execute(text(
+                        f"ALTER TABLE {preparer.quote(table_name)} "
+                        f"ADD COLUMN {preparer.quote(name)} {column_type}"
+                    ))
+                    logger.info(f"Migrated {table_name}: added column {name}")
+
     def drop_all(self):
         """Drop all tables (use with caution!)"""
         logger.warning("Dropping all database tables")
@@ -151,3 +188,126 @@ def session_scope():
 def get_session():
     """Get thread-local session"""
     return db_manager.get_session()
+
+
+def bulk_upsert(session, model, records: List[Dict[str, Any]], update_columns: List[str]) -> int:
+    """
+    Insert or update many rows with set-based statements
+
+    On SQLite and PostgreSQL this issues INSERT ... ON CONFLICT DO UPDATE,
+    chunked to stay under the bind-parameter limit. Other backends go
+    through a staging table (see _upsert_via_staging).
+
+    Args:
+        session: Active session (e.g., from session_scope)
+        model: Mapped class; its primary key is the conflict target
+        records: Row dicts keyed by column name, all with the same keys
+        update_columns: Columns overwritten when the row already exists
+
+    Returns:
+        Number of records written
+    """
+    if not records:
+        return 0
+
+    dialect = session.get_bind().dialect.name
+
+    if dialect in ("mysql", "mariadb"):
+        return _upsert_on_duplicate_key(session, model, records, update_columns)
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return _upsert_via_staging(session, model, records, update_columns)
+
+    primary_key = [column.name for column in model.__table__.primary_key.columns]
+    chunksize = max(1, _MAX_BIND_PARAMS // len(records[0]))
+
+    for start in range(0, len(records), chunksize):
+        stmt = dialect_insert(model).values(records[start:start + chunksize])
+
+        if update_columns:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=primary_key,
+                set_={column: stmt.excluded[column] for column in update_columns}
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=primary_key)
+
+        session.execute(stmt)
+
+    return len(records)
+
+
+def _upsert_on_duplicate_key(session, model, records: List[Dict[str, Any]], update_columns: List[str]) -> int:
+    """
+    MySQL/MariaDB upsert: INSERT ... ON DUPLICATE KEY UPDATE
+
+    Without update columns, existing keys are skipped with INSERT IGNORE.
+    """
+    from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+    chunksize = max(1, _MAX_BIND_PARAMS // len(records[0]))
+
+    for start in range(0, len(records), chunksize):
+        stmt = mysql_insert(model).values(records[start:start + chunksize])
+
+        if update_columns:
+            stmt = stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in update_columns})
+        else:
+            stmt = stmt.prefix_with("IGNORE")
+
+        session.execute(stmt)
+
+    return len(records)
+
+
+def _upsert_via_staging(session, model, records: List[Dict[str, Any]], update_columns: List[str]) -> int:
+    """
+    Portable upsert for backends without a native upsert statement
+
+    Loads the records into a uniquely named scratch table, then applies
+    them with one UPDATE (existing keys) and one INSERT ... SELECT (new
+    keys) on the caller's connection. The unique name keeps concurrent
+    upserts into the same table from sharing a staging table. A regular
+    table is used because TEMPORARY syntax is not portable (MSSQL, Oracle).
+    """
+    table = model.__table__
+    columns = list(records[0].keys())
+    primary_key = [column.name for column in table.primary_key.columns]
+    connection = session.connection()
+
+    stage = Table(
+        f"{table.name}_stage_{uuid.uuid4().hex[:12]}",
+        MetaData(),
+        *[Column(column, table.c[column].type) for column in columns]
+    )
+    stage.create(connection)
+
+    try:
+        for start in range(0, len(records), 1000):
+            connection.execute(insert(stage), records[start:start + 1000])
+
+        same_key = and_(*[stage.c[key] == table.c[key] for key in primary_key])
+
+        if update_columns:
+            session.execute(
+                update(table)
+                .where(exists().where(same_key))
+                .values({
+                    column: select(stage.c[column]).where(same_key).scalar_subquery()
+                    for column in update_columns
+                })
+            )
+
+        session.execute(
+            insert(table).from_select(
+                columns,
+                select(*[stage.c[column] for column in columns]).where(~exists().where(same_key))
+            )
+        )
+    finally:
+        stage.drop(connection)
+
+    return len(records)
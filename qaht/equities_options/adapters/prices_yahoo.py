@@ -7,6 +7,7 @@ import pandas as pd
 from typing import List, Optional
 from datetime import datetime, timedelta
 import logging
+from sqlalchemy import select
 
 from ...db import session_scope
 from ...schemas import PriceOHLC
@@ -115,31 +116,45 @@ def upsert_prices(df: pd.DataFrame):
         inserted = 0
         updated = 0
 
-        for _, row in df.iterrows():
-            # Check if exists
-            existing = session.get(PriceOHLC, (row['symbol'], row['date']))
+        # One query for every row this frame could touch, instead of a
+        # session.get per row
+        existing_rows = session.execute(
+            select(PriceOHLC)
+            .where(
+                PriceOHLC.symbol.in_(df['symbol'].unique().tolist()),
+                PriceOHLC.date.between(df['date'].min(), df['date'].max())
+            )
+        ).scalars()
+        existing_by_key = {(price.symbol, price.date): price for price in existing_rows}
+
+        price_columns = ['open', 'high', 'low', 'close', 'volume']
+        rows = df[['symbol', 'date'] + price_columns].astype({column: float for column in price_columns})
+
+        for symbol, date, open_, high, low, close, volume in rows.itertuples(index=False, name=None):
+            existing = existing_by_key.get((symbol, date))
 
             if existing:
                 # Update existing record
-                existing.open = float(row['open'])
-                existing.high = float(row['high'])
-                existing.low = float(row['low'])
-                existing.close = float(row['close'])
-                existing.volume = float(row['volume'])
+                existing.open = open_
+                existing.high = high
+                existing.low = low
+                existing.close = close
+                existing.volume = volume
                 updated += 1
             else:
                 # Insert new record
                 price = PriceOHLC(
-                    symbol=row['symbol'],
-                    date=row['date'],
-                    open=float(row['open']),
-                    high=float(row['high']),
-                    low=float(row['low']),
-                    close=float(row['close']),
-                    volume=float(row['volume']),
+                    symbol=symbol,
+                    date=date,
+                    open=open_,
+                    high=high,
+                    low=low,
+                    close=close,
+                    volume=volume,
                     asset_type='stock'
                 )
                 session.add(price)
+                existing_by_key[(symbol, date)] = price
                 inserted += 1
 
         logger.info(f"Upserted prices: {inserted} inserted, {updated} updated")
@@ -171,7 +186,6 @@ def get_latest_price(symbol: str) -> Optional[float]:
         Latest close price or None
     """
     with session_scope() as session:
-        from sqlalchemy import select
         result = session.execute(
             select(PriceOHLC)
             .where(PriceOHLC.symbol == symbol)
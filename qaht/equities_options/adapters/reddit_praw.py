@@ -9,10 +9,12 @@ from datetime import datetime, timedelta
 from collections import defaultdict
 import logging
 import os
+import queue
 
 from ...db import session_scope
 from ...schemas import SocialMentions
 from ...utils.retry import retry_with_backoff
+from ...utils.parallel import process_concurrently
 from ...config import get_config
 
 logger = logging.getLogger("qaht.adapters.reddit")
@@ -61,6 +63,20 @@ def get_reddit_client() -> praw.Reddit:
     return reddit
 
 
+# Idle clients, kept for the life of the process so repeated runs reuse
+# their HTTP sessions and OAuth tokens. PRAW instances are not thread-safe,
+# so each worker checks one out exclusively.
+_CLIENTS = queue.Queue()
+
+
+def _checkout_client() -> praw.Reddit:
+    """Take an idle client from the pool, creating one if none is free"""
+    try:
+        return _CLIENTS.get_nowait()
+    except queue.Empty:
+        return get_reddit_client()
+
+
 @retry_with_backoff(max_retries=2, initial_delay=3.0)
 def search_symbol_mentions(
     reddit: praw.Reddit,
@@ -82,33 +98,36 @@ def search_symbol_mentions(
     Returns:
         Dict with mention count, authors, engagement data
     """
-    mentions = []
+    mentions = {}
     authors = set()
     total_comments = 0
     total_score = 0
 
-    # Search patterns
-    search_queries = [f"${symbol}", f"#{symbol}", symbol]
+    # Search patterns, combined into one query per subreddit
+    search_query = " OR ".join([f'"${symbol}"', f'"#{symbol}"', symbol])
 
     for sub_name in subreddits:
         try:
             subreddit = reddit.subreddit(sub_name)
 
-            for query in search_queries:
-                for submission in subreddit.search(query, time_filter=time_filter, limit=limit):
-                    mentions.append({
-                        'title': submission.title,
-                        'author': str(submission.author) if submission.author else '[deleted]',
-                        'score': submission.score,
-                        'num_comments': submission.num_comments,
-                        'created_utc': submission.created_utc
-                    })
+            for submission in subreddit.search(search_query, time_filter=time_filter, limit=limit):
+                # A post matching several patterns is still one mention
+                if submission.id in mentions:
+                    continue
+
+                mentions[submission.id] = {
+                    'title': submission.title,
+                    'author': str(submission.author) if submission.author else '[deleted]',
+                    'score': submission.score,
+                    'num_comments': submission.num_comments,
+                    'created_utc': submission.created_utc
+                }
 
-                    if submission.author:
-                        authors.add(str(submission.author))
+                if submission.author:
+                    authors.add(str(submission.author))
 
-                    total_comments += submission.num_comments
-                    total_score += submission.score
+                total_comments += submission.num_comments
+                total_score += submission.score
 
         except Exception as e:
             logger.warning(f"Error searching {sub_name} for {symbol}: {e}")
@@ -138,29 +157,42 @@ def fetch_reddit_mentions(symbols: List[str], asset_type: str = 'stock') -> pd.D
     Returns:
         DataFrame with social mention data
     """
-    reddit = get_reddit_client()
+    max_workers = max(1, min(config.api_rate_limit_concurrency, len(symbols)))
+
+    # Fail fast on missing credentials before fanning out
+    _CLIENTS.put(_checkout_client())
 
     subreddits = EQUITY_SUBREDDITS if asset_type == 'stock' else CRYPTO_SUBREDDITS
     today = datetime.now().strftime('%Y-%m-%d')
 
-    results = []
-
-    for symbol in symbols:
+    def fetch_symbol(symbol):
+        reddit = _checkout_client()
         try:
             data = search_symbol_mentions(reddit, symbol, subreddits, time_filter="day", limit=50)
-
-            results.append({
-                'symbol': symbol.upper(),
-                'date': today,
-                'reddit_count': data['mention_count'],
-                'author_entropy': data['author_diversity'],  # Higher = more diverse
-                'engagement_ratio': data['engagement_ratio']
-            })
-
-            logger.info(f"{symbol}: {data['mention_count']} mentions, {data['author_diversity']} unique authors")
-
         except Exception as e:
             logger.error(f"Failed to fetch Reddit data for {symbol}: {e}")
+            return None
+        finally:
+            _CLIENTS.put(reddit)
+
+        logger.info(f"{symbol}: {data['mention_count']} mentions, {data['author_diversity']} unique authors")
+
+        return {
+            'symbol': symbol.upper(),
+            'date': today,
+            'reddit_count': data['mention_count'],
+            'author_entropy': data['author_diversity'],  # Higher = more diverse
+            'engagement_ratio': data['engagement_ratio']
+        }
+
+    rows = process_concurrently(
+        symbols,
+        fetch_symbol,
+        max_workers=max_workers,
+        description="Fetching Reddit mentions",
+        show_progress=False
+    )
+    results = [row for row in rows if row is not None]
 
     if not results:
         return pd.DataFrame()
@@ -10,7 +10,7 @@ import logging
 from ...db import session_scope
 from ...schemas import SocialMentions, Factors
 from ...config import get_config
-from sqlalchemy import select
+from sqlalchemy import bindparam, func, insert, select, update
 
 logger = logging.getLogger("qaht.features.social")
 config = get_config()
@@ -69,32 +69,45 @@ def compute_social_delta(symbol: str, window: int = 7):
         # Engagement quality
         df['engagement_ratio_7d'] = df['engagement_ratio'].rolling(window=window, min_periods=window).mean()
 
-        # Update Factors table
-        for _, row in df.dropna(subset=['social_delta_7d']).iterrows():
-            date_str = row['date'].strftime('%Y-%m-%d')
-
-            # CRITICAL FIX: Use tuple for composite PK
-            factor = session.get(Factors, (symbol, date_str))
-
-            if not factor:
-                # Create new factor row if it doesn't exist (happens if social data comes before price)
-                factor = Factors(
-                    symbol=symbol,
-                    date=date_str,
-                    bb_width_pct=None,
-                    ma_spread_pct=None,
-                    social_delta_7d=float(row['social_delta_7d']),
-                    author_entropy_7d=float(row['author_entropy_7d']) if pd.notna(row['author_entropy_7d']) else None,
-                    engagement_ratio_7d=float(row['engagement_ratio_7d']) if pd.notna(row['engagement_ratio_7d']) else None
+        # Update Factors table: one bulk INSERT for new dates, one executemany
+        # UPDATE for existing ones (rows appear here first if social data
+        # arrives before price)
+        features = df.dropna(subset=['social_delta_7d'])
+        features = (
+            features.assign(date=features['date'].dt.strftime('%Y-%m-%d'))
+            [['date', 'social_delta_7d', 'author_entropy_7d', 'engagement_ratio_7d']]
+            .astype(object)
+        )
+        rows = features.where(features.notna(), None).to_dict(orient='records')
+
+        if rows:
+            existing_dates = set(session.execute(
+                select(Factors.date)
+                .where(Factors.symbol == symbol, Factors.date >= rows[0]['date'])
+            ).scalars())
+
+            new_rows = [dict(row, symbol=symbol) for row in rows if row['date'] not in existing_dates]
+            update_rows = [
+                {f"b_{key}": value for key, value in row.items()}
+                for row in rows if row['date'] in existing_dates
+            ]
+
+            if new_rows:
+                session.execute(insert(Factors), new_rows)
+
+            if update_rows:
+                # Keep stored entropy/engagement when the new rolling value is missing
+                table = Factors.__table__
+                session.execute(
+                    update(table)
+                    .where(table.c.symbol == symbol, table.c.date == bindparam('b_date'))
+                    .values(
+                        social_delta_7d=bindparam('b_social_delta_7d'),
+                        author_entropy_7d=func.coalesce(bindparam('b_author_entropy_7d'), table.c.author_entropy_7d),
+                        engagement_ratio_7d=func.coalesce(bindparam('b_engagement_ratio_7d'), table.c.engagement_ratio_7d)
+                    ),
+                    update_rows
                 )
-                session.add(factor)
-            else:
-                # Update existing
-                factor.social_delta_7d = float(row['social_delta_7d'])
-                if pd.notna(row['author_entropy_7d']):
-                    factor.author_entropy_7d = float(row['author_entropy_7d'])
-                if pd.notna(row['engagement_ratio_7d']):
-                    factor.engagement_ratio_7d = float(row['engagement_ratio_7d'])
 
         logger.debug(f"Updated social deltas for {symbol}")
 
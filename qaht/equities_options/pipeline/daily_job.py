@@ -9,7 +9,7 @@ from datetime import datetime
 
 from ...config import get_config
 from ...db import init_db
-from ...utils.parallel import process_concurrently
+from ...utils.parallel import process_concurrently, run_steps_concurrently
 from ...logging_conf import setup_logging
 
 from ..adapters.prices_yahoo import fetch_and_upsert
@@ -73,32 +73,21 @@ def run(universe_csv: Optional[str] = None) -> dict:
 
     logger.info(f"Starting equities pipeline with {len(symbols)} symbols")
 
-    # Step 1: Fetch price data
-    monitor.start_step("price_ingestion")
-    logger.info("Fetching prices from Yahoo Finance...")
+    # Steps 1-2: Ingestion from Yahoo Finance and Reddit (independent hosts)
+    logger.info("Fetching prices (Yahoo Finance) and Reddit mentions...")
 
-    try:
-        row_count = fetch_and_upsert(
-            symbols,
-            period=f"{config.pipeline.lookback_days}d"
-        )
-        logger.info(f"Fetched {row_count} price rows")
-    except Exception as e:
-        logger.error(f"Price ingestion failed: {e}")
-
-    monitor.end_step("price_ingestion")
-
-    # Step 2: Fetch social data
-    monitor.start_step("social_ingestion")
-    logger.info("Fetching Reddit mentions...")
-
-    try:
-        social_count = fetch_and_upsert_reddit(symbols, asset_type='stock')
-        logger.info(f"Fetched social data for {social_count} symbols")
-    except Exception as e:
-        logger.error(f"Social ingestion failed: {e}")
-
-    monitor.end_step("social_ingestion")
+    counts = run_steps_concurrently(
+        [
+            ('price_ingestion', lambda: fetch_and_upsert(symbols, period=f"{config.pipeline.lookback_days}d")),
+            ('social_ingestion', lambda: fetch_and_upsert_reddit(symbols, asset_type='stock')),
+        ],
+        on_start=monitor.start_step,
+        on_end=monitor.end_step
+    )
+    logger.info(
+        f"Fetched {counts['price_ingestion']} price rows, "
+        f"social data for {counts['social_ingestion']} symbols"
+    )
 
     # Step 3: Compute technical features
     monitor.start_step("technical_features")
@@ -19,12 +19,20 @@ from sklearn.isotonic import IsotonicRegression
 from ..db import session_scope
 from ..schemas import Factors, Labels, Predictions
 from ..config import get_config
+from ..utils.serialization import dumps
 from .registry import FEATURES, validate_features, get_features_for_asset_type
-from sqlalchemy import select, text
+from sqlalchemy import select, text, func, and_
 
 logger = logging.getLogger("qaht.scoring.ridge")
 config = get_config()
 
+# Conviction tiers as (minimum quantum score, level), highest first
+CONVICTION_TIERS = (
+    (90, "MAX"),
+    (80, "HIGH"),
+    (70, "MED"),
+)
+
 
 def load_training_data(symbols: Optional[List[str]] = None, asset_type: str = 'stock') -> pd.DataFrame:
     """
@@ -172,59 +180,53 @@ def score_symbols(symbols: List[str], model_dict: Dict, asset_type: str = 'stock
     calibrator = model_dict['calibrator']
     features = model_dict['features']
 
+    # Latest factor row for every symbol in one query
+    latest = (
+        select(Factors.symbol, func.max(Factors.date).label('date'))
+        .where(Factors.symbol.in_(symbols))
+        .group_by(Factors.symbol)
+        .subquery()
+    )
+    stmt = (
+        select(Factors.symbol, Factors.date, *[getattr(Factors, feat) for feat in features if hasattr(Factors, feat)])
+        .join(latest, and_(Factors.symbol == latest.c.symbol, Factors.date == latest.c.date))
+    )
+
     with session_scope() as session:
-        # Get latest factors for each symbol
-        results = []
-
-        for symbol in symbols:
-            factor = session.execute(
-                select(Factors)
-                .where(Factors.symbol == symbol)
-                .order_by(Factors.date.desc())
-                .limit(1)
-            ).scalar_one_or_none()
-
-            if not factor:
-                logger.warning(f"No factors found for {symbol}")
-                continue
-
-            # Extract feature values
-            feature_values = {}
-            for feat in features:
-                value = getattr(factor, feat, None)
-                feature_values[feat] = value if value is not None else 0.0
-
-            # Create single-row DataFrame
-            X = pd.DataFrame([feature_values])
-
-            # Predict
-            pred_return = pipeline.predict(X)[0]
-            prob_explosion = calibrator.predict([pred_return])[0]
-
-            # Quantum score (0-100 scale)
-            quantum_score = int(prob_explosion * 100)
-
-            # Conviction level
-            if quantum_score >= 90:
-                conviction = "MAX"
-            elif quantum_score >= 80:
-                conviction = "HIGH"
-            elif quantum_score >= 70:
-                conviction = "MED"
-            else:
-                conviction = "LOW"
-
-            results.append({
-                'symbol': symbol,
-                'date': factor.date,
-                'quantum_score': quantum_score,
-                'prob_hit_10d': prob_explosion,
-                'pred_return': pred_return,
-                'conviction_level': conviction,
-                'components': feature_values  # For explainability
-            })
-
-    df = pd.DataFrame(results)
+        factors = pd.read_sql_query(stmt, session.bind)
+
+    missing = sorted(set(symbols) - set(factors['symbol']))
+    if missing:
+        logger.warning(f"No factors found for {', '.join(missing)}")
+
+    if factors.empty:
+        logger.info("Scored 0 symbols")
+        return pd.DataFrame()
+
+    # Extract feature values (missing -> 0.0)
+    X = factors.reindex(columns=features).astype(np.float64).fillna(0.0)
+
+    # Predict the whole batch at once
+    pred_return = pipeline.predict(X)
+    prob_explosion = calibrator.predict(pred_return)
+
+    # Quantum score (0-100 scale) and conviction tier
+    quantum_score = np.clip((prob_explosion * 100).astype(int), 0, 100)
+    conviction = np.select(
+        [quantum_score >= floor for floor, _ in CONVICTION_TIERS],
+        [level for _, level in CONVICTION_TIERS],
+        default="LOW"
+    )
+
+    df = pd.DataFrame({
+        'symbol': factors['symbol'],
+        'date': factors['date'],
+        'quantum_score': quantum_score,
+        'prob_hit_10d': prob_explosion,
+        'pred_return': pred_return,
+        'conviction_level': conviction,
+        'components': X.to_dict(orient='records')  # For explainability
+    })
     logger.info(f"Scored {len(df)} symbols")
 
     return df
@@ -242,8 +244,7 @@ def upsert_predictions(df: pd.DataFrame):
             existing = session.get(Predictions, (row['symbol'], row['date']))
 
             # Convert components dict to JSON string
-            import json
-            components_json = json.dumps(row['components'])
+            components_json = dumps(row['components'])
 
             if existing:
                 existing.quantum_score = row['quantum_score']
@@ -2,7 +2,7 @@
 Concurrent data processing utilities
 """
 import concurrent.futures
-from typing import List, Callable, Any, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import logging
 from tqdm import tqdm
 
@@ -118,3 +118,48 @@ def parallel_map(
     """
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
         return list(executor.map(func, items))
+
+
+def run_steps_concurrently(
+    steps: List[Tuple[str, Callable[[], Any]]],
+    on_start: Optional[Callable[[str], None]] = None,
+    on_end: Optional[Callable[[str], None]] = None
+) -> Dict[str, Any]:
+    """
+    Run independent named steps concurrently
+
+    Meant for I/O-bound steps with no data dependency (e.g., ingestion
+    from different hosts): wall time is the slowest step instead of the
+    sum. A failing step is logged and yields None without stopping the
+    others.
+
+    Args:
+        steps: (name, callable) pairs; callables take no arguments
+        on_start: Called with the step name before it runs
+        on_end: Called with the step name after it finishes, even on failure
+
+    Returns:
+        Dict of step name -> result (None for failed steps)
+
+    Example:
+        counts = run_steps_concurrently(
+            [('prices', fetch_prices), ('social', fetch_social)],
+            on_start=monitor.start_step,
+            on_end=monitor.end_step
+        )
+    """
+    def run_step(step):
+        name, func = step
+        if on_start:
+            on_start(name)
+
+        try:
+            return name, func()
+        except Exception as e:
+            logger.error(f"{name.replace('_', ' ').capitalize()} failed: {e}")
+            return name, None
+        finally:
+            if on_end:
+                on_end(name)
+
+    return dict(parallel_map(run_step, steps, max_workers=max(1, len(steps))))
@@ -0,0 +1,55 @@
+"""
+Client-side rate limiting
+Token bucket shared across threads: blocks only when the budget is spent
+"""
+import threading
+import time
+import logging
+
+logger = logging.getLogger("qaht.rate_limit")
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket
+
+    Holds up to `calls` tokens, refilled continuously at `calls / period`
+    tokens per second. A full bucket allows a burst of `calls` requests;
+    after that, callers are paced to the sustained rate.
+
+    Example:
+        limiter = RateLimiter(calls=25, period=60.0)
+
+        def fetch(url):
+            limiter.acquire()
+            return requests.get(url)
+    """
+
+    def __init__(self, calls: int, period: float = 60.0):
+        """
+        Args:
+            calls: Requests allowed per period (also the burst size)
+            period: Period length in seconds
+        """
+        self.capacity = float(calls)
+        self.rate = calls / period
+        self._tokens = float(calls)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+
+                wait = (1.0 - self._tokens) / self.rate
+
+            logger.debug(f"Rate limit reached, waiting {wait:.2f}s")
+            time.sleep(wait)
@@ -10,6 +10,20 @@ from typing import Callable, Tuple, Type
 
 logger = logging.getLogger("qaht.retry")
 
+# 4xx statuses that are worth retrying (timeout, rate limited)
+RETRYABLE_CLIENT_STATUSES = frozenset({408, 429})
+
+
+def _is_permanent_http_error(e: Exception) -> bool:
+    """True for HTTP 4xx errors that will fail the same way on every attempt"""
+    response = getattr(e, 'response', None)
+    status = getattr(response, 'status_code', None)
+
+    if not isinstance(status, int):
+        return False
+
+    return 400 <= status < 500 and status not in RETRYABLE_CLIENT_STATUSES
+
 
 def retry_with_backoff(
     exceptions: Tuple[Type[Exception], ...] = (Exception,),
@@ -22,6 +36,9 @@ def retry_with_backoff(
     """
     Decorator that retries a function with exponential backoff
 
+    HTTP 4xx errors (other than 408 and 429) are raised immediately:
+    bad symbols or parameters fail identically on every attempt.
+
     Args:
         exceptions: Tuple of exception types to catch
         max_retries: Maximum number of retry attempts
@@ -46,6 +63,10 @@ def retry_with_backoff(
                     return func(*args, **kwargs)
 
                 except exceptions as e:
+                    if _is_permanent_http_error(e):
+                        logger.error(f"Non-retryable error in {func.__name__}: {str(e)}")
+                        raise
+
                     if attempt == max_retries:
                         logger.error(
                             f"Final attempt {attempt + 1} failed for {func.__name__}: {str(e)}"
@@ -0,0 +1,54 @@
+"""
+JSON serialization helpers backed by orjson
+"""
+from typing import Any, Union
+
+import orjson
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode a JSON document
+
+    orjson parses bytes directly, so pass `response.content` rather than
+    `response.text` to skip the intermediate str decode.
+
+    Args:
+        data: Raw JSON bytes or string
+
+    Returns:
+        Decoded Python object
+    """
+    return orjson.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """
+    Encode an object as a JSON string
+
+    numpy scalars and arrays are serialized directly; NaN and infinity
+    become null rather than the non-standard NaN token.
+
+    Args:
+        obj: Object to encode
+
+    Returns:
+        JSON text
+    """
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
+def parse_response(response) -> Any:
+    """
+    Decode the JSON body of an HTTP response
+
+    Reads the full body before parsing so the connection is released
+    back to the keep-alive pool.
+
+    Args:
+        response: requests.Response
+
+    Returns:
+        Decoded Python object
+    """
+    return loads(response.content)
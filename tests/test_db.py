@@ -0,0 +1,67 @@
+"""
+Tests for the portable staging-table upsert fallback
+"""
+import os
+
+os.environ.setdefault("QAHT_DB_URL", "sqlite://")
+
+import pytest
+from sqlalchemy import create_engine, inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from qaht.db import _upsert_via_staging
+from qaht.schemas import Base, Labels
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        yield session
+
+    engine.dispose()
+
+
+def _labels(session):
+    return session.execute(
+        select(Labels.date, Labels.fwd_ret_10d, Labels.explosive_10d).order_by(Labels.date)
+    ).all()
+
+
+def test_staging_upsert_inserts_and_updates(session):
+    _upsert_via_staging(
+        session, Labels,
+        [{'symbol': 'A', 'date': d, 'fwd_ret_10d': 0.1, 'explosive_10d': False} for d in ('1', '2')],
+        update_columns=['fwd_ret_10d']
+    )
+    written = _upsert_via_staging(
+        session, Labels,
+        [{'symbol': 'A', 'date': d, 'fwd_ret_10d': 0.5, 'explosive_10d': True} for d in ('2', '3')],
+        update_columns=['fwd_ret_10d']
+    )
+
+    assert written == 2
+    # Existing key: only update_columns change; new key: full row inserted
+    assert _labels(session) == [('1', 0.1, False), ('2', 0.5, False), ('3', 0.5, True)]
+
+
+def test_staging_upsert_without_update_columns_keeps_existing(session):
+    record = {'symbol': 'A', 'date': '1', 'fwd_ret_10d': 0.1, 'explosive_10d': False}
+    _upsert_via_staging(session, Labels, [record], update_columns=[])
+    _upsert_via_staging(session, Labels, [{**record, 'fwd_ret_10d': 0.9}], update_columns=[])
+
+    assert _labels(session) == [('1', 0.1, False)]
+
+
+def test_staging_upsert_drops_stage_table(session):
+    _upsert_via_staging(
+        session, Labels,
+        [{'symbol': 'A', 'date': '1', 'fwd_ret_10d': 0.1, 'explosive_10d': False}],
+        update_columns=['fwd_ret_10d']
+    )
+
+    tables = inspect(session.connection()).get_table_names()
+    assert not [name for name in tables if name.startswith('labels_stage')]
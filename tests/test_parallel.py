@@ -0,0 +1,20 @@
+"""
+Tests for concurrent step execution
+"""
+from qaht.utils.parallel import run_steps_concurrently
+
+
+def test_run_steps_concurrently_isolates_failures():
+    events = []
+
+    def fail():
+        raise RuntimeError("boom")
+
+    results = run_steps_concurrently(
+        [('prices', lambda: 3), ('social', fail)],
+        on_start=lambda name: events.append(('start', name)),
+        on_end=lambda name: events.append(('end', name))
+    )
+
+    assert results == {'prices': 3, 'social': None}
+    assert sorted(events) == [('end', 'prices'), ('end', 'social'), ('start', 'prices'), ('start', 'social')]